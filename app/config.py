@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import (
     Field,
@@ -21,6 +21,10 @@ class Settings(BaseSettings):
     api_host: str = Field("0.0.0.0", env="API_HOST")
     api_port: int = Field(8000, gt=0, lt=65536, env="API_PORT")
 
+    # Redis look-aside cache (disabled when REDIS_URL is unset)
+    redis_url: Optional[str] = Field(None, env="REDIS_URL")
+    match_cache_ttl: int = Field(60, ge=1, le=3600, env="MATCH_CACHE_TTL")
+
     # CORS
     allowed_origins_raw: str = Field("http://localhost:3000", env="ALLOWED_ORIGINS")
 
@@ -4,7 +4,9 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from redis import asyncio as aioredis
 from app.config import settings
+from app.services.match_service import MatchService
 
 # Ensure startup logs are visible when running directly (won't override existing handlers)
 if not logging.getLogger().hasHandlers():
@@ -42,8 +44,23 @@ async def db_lifespan(app: FastAPI):
         db: Optional[AsyncIOMotorDatabase] = client[settings.mongo_db_name]
         app.state.mongodb_client = client
         app.state.mongodb = db
+        # One service instance for the process lifetime: it holds nothing but
+        # collection handles, so building those once at startup beats
+        # re-deriving eight of them on every request.
+        app.state.match_service = MatchService(client)
+        try:
+            await app.state.match_service.ensure_indexes()
+        except Exception:
+            # Indexes are an optimization; a failed build must not stop the
+            # app from serving.
+            logger.exception("🟠 Index creation failed; continuing without")
         logger.info("🟢 MongoDB connected (db=%s)", db.name)
 
+        app.state.redis = None
+        if settings.redis_url:
+            app.state.redis = aioredis.from_url(settings.redis_url)
+            logger.info("🟢 Redis cache enabled")
+
         yield  # application runs while yielded
 
     except Exception:
@@ -53,6 +70,10 @@ async def db_lifespan(app: FastAPI):
             client.close()
         raise
     finally:
+        redis_client = getattr(app.state, "redis", None)
+        if redis_client:
+            await redis_client.aclose()
+            logger.info("🟠 Redis connection closed")
         client = getattr(app.state, "mongodb_client", None)
         if client:
             client.close()
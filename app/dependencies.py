@@ -1,8 +1,25 @@
+from typing import Optional
+
 from fastapi import Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from redis.asyncio import Redis
+
+from app.services.match_service import MatchService
 
 def get_database(request: Request) -> AsyncIOMotorDatabase:
     db = getattr(request.app.state, "mongodb_client", None)
     if db is None:
         raise RuntimeError("Mongo database not initialized")
-    return db
\ No newline at end of file
+    return db
+
+def get_match_service(request: Request) -> MatchService:
+    # Singleton built in db_lifespan; collection handles are resolved once at
+    # startup instead of per request.
+    svc = getattr(request.app.state, "match_service", None)
+    if svc is None:
+        raise RuntimeError("Match service not initialized")
+    return svc
+
+def get_redis(request: Request) -> Optional[Redis]:
+    # None when REDIS_URL is not configured; callers treat that as cache-off.
+    return getattr(request.app.state, "redis", None)
\ No newline at end of file
@@ -47,4 +47,20 @@ async def db_stats(db: AsyncIOMotorDatabase = Depends(get_database)):
         stats = await db.command("dbstats", scale=1)
         return JSONResponse(stats)
     except Exception as e:
-        raise HTTPException(503, f"DB not ready: {e!s}")
\ No newline at end of file
+        raise HTTPException(503, f"DB not ready: {e!s}")
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Every endpoint is a thin IO-bound shim over Mongo, so the event loop and
+    # HTTP parser are the hot path: pin uvloop/httptools (shipped via
+    # uvicorn[standard]) rather than trusting "auto" detection, and keep the
+    # per-request access log off.
+    uvicorn.run(
+        "app.main:app",
+        host=settings.api_host,
+        port=settings.api_port,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
\ No newline at end of file
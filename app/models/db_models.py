@@ -1,12 +1,19 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+import sys
+from dataclasses import dataclass, field, fields
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 
 class CivCount(BaseModel):
     civ: str
     count: int
 
-class StatModel(BaseModel):
+# Internal bookkeeping only — never validated from client input, and built
+# N players x 3 scopes per mutation. A slotted dataclass skips the
+# per-instance __dict__ and pydantic-core validation that a BaseModel pays
+# on every construction.
+@dataclass(slots=True)
+class StatModel:
     index: int
     id: int  # discord_id
     mu: float
@@ -17,7 +24,10 @@ class StatModel(BaseModel):
     subbedIn: int
     subbedOut: int
     civs: Optional[Dict[str, int]] = None
-    lastModified: datetime = Field(default_factory=datetime.utcnow)
+    lastModified: datetime = field(default_factory=datetime.utcnow)
+
+# For filtering raw Mongo rows down to constructor kwargs.
+STAT_FIELDS = frozenset(f.name for f in fields(StatModel))
 
 class PlayerModel(BaseModel):
     steam_id: Optional[str] = None
@@ -35,12 +45,22 @@ class PlayerModel(BaseModel):
     is_sub: bool = False
     subbed_out: bool = False
 
+    # civ/leader come from a small closed set repeated across every player of
+    # every match; interning dedupes the allocations and makes dict lookups on
+    # them a pointer compare.
+    @field_validator("civ", "leader", mode="after")
+    @classmethod
+    def _intern(cls, v: Optional[str]) -> Optional[str]:
+        return sys.intern(v) if v is not None else v
+
 class MatchModel(BaseModel):
-    game: str  # parsers return "civ6" or "civ7"
+    # Literal gives pydantic-core an O(1) set-lookup validator instead of a
+    # generic str check; the vocabularies come from the save parsers.
+    game: Literal["civ6", "civ7"]
     turn: int
     age: Optional[str] = None
     map_type: str
-    game_mode: str  # allow "", "FFA", "Teamer", "Duel"
+    game_mode: Literal["", "duel", "ffa", "teamer"]
     is_cloud: bool
     players: List[PlayerModel]
     parser_version: str
@@ -50,5 +70,10 @@ class MatchModel(BaseModel):
     approver_discord_id: Optional[str] = None
     flagged: bool = False
     flagged_by: Optional[str] = None
-    save_file_hash: str
-    reporter_discord_id: str
\ No newline at end of file
+    save_file_hash: bytes  # raw digest; rendered as base64 on the wire
+    reporter_discord_id: str
+
+    @field_validator("game", "game_mode", "map_type", "age", mode="after")
+    @classmethod
+    def _intern(cls, v: Optional[str]) -> Optional[str]:
+        return sys.intern(v) if v is not None else v
\ No newline at end of file
@@ -1,6 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
 class PlayerSchema(BaseModel):
     steam_id: Optional[str] = None
@@ -20,24 +19,29 @@ class PlayerSchema(BaseModel):
 
 class MatchResponse(BaseModel):
     match_id: str
-    game: str
+    game: Literal["civ6", "civ7"]
     turn: int
     age: Optional[str] = None
     map_type: str
-    game_mode: str
+    game_mode: Literal["", "duel", "ffa", "teamer"]
     is_cloud: bool
     players: List[PlayerSchema]
     parser_version: str
     discord_messages_id_list: List[str]
-    created_at: datetime
-    approved_at: Optional[datetime] = None
+    created_at_ms: int  # epoch milliseconds; clients format locally
+    approved_at_ms: Optional[int] = None
     approver_discord_id: Optional[str] = None
     flagged: bool
     flagged_by: Optional[str] = None
     save_file_hash: str
     reporter_discord_id: str
 
+# Built once at import: TypeAdapter instantiation compiles a pydantic-core
+# validator, which is too expensive to repeat per request.
+PLAYERS_TA = TypeAdapter(List[PlayerSchema])
+
 class MatchUpdate(BaseModel):
+    op: Literal["update_match"] = "update_match"
     match_id: str
     players: Optional[List[PlayerSchema]] = None
     confirmed: Optional[bool] = None
@@ -45,48 +49,82 @@ class MatchUpdate(BaseModel):
     flagged_by: Optional[str] = None
 
 class ChangeOrder(BaseModel):
+    op: Literal["change_order"] = "change_order"
     match_id: str
     new_order: str # The order of players as a string, e.g. "1 2 3 4" separated by spaces
     discord_message_id: str
 
 class DeletePendingMatch(BaseModel):
+    op: Literal["delete_pending_match"] = "delete_pending_match"
     match_id: str
 
 class TriggerQuit(BaseModel):
+    op: Literal["trigger_quit"] = "trigger_quit"
     match_id: str
     quitter_discord_id: str
     discord_message_id: str
 
 class AppendDiscordMessageID(BaseModel):
+    op: Literal["append_message_id"] = "append_message_id"
     match_id: str
     discord_message_id: List[str]
 
 class AssignDiscordId(BaseModel):
+    op: Literal["assign_discord_id"] = "assign_discord_id"
     match_id: str
     player_id: str
     player_discord_id: str
     discord_message_id: str
 
 class AssignDiscordIdAll(BaseModel):
+    op: Literal["assign_discord_id_all"] = "assign_discord_id_all"
     match_id: str
     discord_id_list: List[str]
     discord_message_id: str
 
 class AssignSub(BaseModel):
+    op: Literal["assign_sub"] = "assign_sub"
     match_id: str
     sub_in_id: str
     sub_out_discord_id: str
     discord_message_id: str
     
 class RemoveSub(BaseModel):
+    op: Literal["remove_sub"] = "remove_sub"
     match_id: str
     sub_out_id: str
     discord_message_id: str
 
+class BatchMatchOp(BaseModel):
+    # Only ops that map 1:1 onto a single Mongo write belong here; anything
+    # that recomputes ratings has to go through its dedicated endpoint.
+    op: Literal["update", "append_message_id", "delete"]
+    payload: Dict[str, Any]
+
 class ApproveMatch(BaseModel):
+    op: Literal["approve_match"] = "approve_match"
     match_id: str
     approver_discord_id: str
     
+# One tagged-union body for the consolidated /mutate/ endpoint: the op field
+# picks the validator, so dispatch costs a single dict lookup. The defaults on
+# op keep the per-operation endpoints working for clients that don't send it.
+MutationPayload = Annotated[
+    Union[
+        MatchUpdate,
+        ChangeOrder,
+        DeletePendingMatch,
+        TriggerQuit,
+        AppendDiscordMessageID,
+        AssignDiscordId,
+        AssignDiscordIdAll,
+        AssignSub,
+        RemoveSub,
+        ApproveMatch,
+    ],
+    Field(discriminator="op"),
+]
+
 class GetLeaderboardRequest(BaseModel):
     game: str
     game_type: str
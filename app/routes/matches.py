@@ -1,210 +1,240 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Form
-from app.dependencies import get_database
-from app.models.schemas import MatchResponse, MatchUpdate, ChangeOrder, DeletePendingMatch, TriggerQuit, AppendDiscordMessageID, AssignDiscordId, AssignDiscordIdAll, AssignSub, RemoveSub, ApproveMatch, GetLeaderboardRequest, LeaderboardRankingResponse
+from functools import wraps
+from typing import List, Optional
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Form, Response
+from fastapi.responses import ORJSONResponse
+from redis.asyncio import Redis
+from app.config import settings
+from app.dependencies import get_match_service, get_redis
+from app.models.schemas import MatchResponse, MatchUpdate, ChangeOrder, DeletePendingMatch, TriggerQuit, AppendDiscordMessageID, AssignDiscordId, AssignDiscordIdAll, AssignSub, RemoveSub, ApproveMatch, BatchMatchOp, GetLeaderboardRequest, LeaderboardRankingResponse, MutationPayload
 from app.services.match_service import MatchService, InvalidIDError, NotFoundError, MatchServiceError
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/v1", tags=["matches"])
+router = APIRouter(prefix="/api/v1", tags=["matches"], default_response_class=ORJSONResponse)
 
-@router.put("/get-match/", response_model=MatchResponse)
-async def get_match(match_id: str = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    try:
-        return await svc.get(match_id)
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid match ID: {match_id}")
-        raise HTTPException(status_code=400, detail="Invalid match ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-
-@router.put("/append-message-id-list/", response_model=MatchResponse)
-async def append_message_id_list(payload: AppendDiscordMessageID = Form(), db = Depends(get_database)):
-    match_id = payload.match_id
-    discord_message_id = payload.discord_message_id
-    svc = MatchService(db)
-    try:
-        return await svc.append_discord_message_id_list(match_id, discord_message_id)
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid match ID: {match_id}")
-        raise HTTPException(status_code=400, detail="Invalid match ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/update-match/", response_model=MatchResponse)
-async def update_match(payload: MatchUpdate = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    match_id = payload.match_id
-    try:
-        return await svc.update(match_id, payload.dict(exclude_unset=True))
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid match ID: {match_id}")
-        raise HTTPException(status_code=400, detail="Invalid match ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/change-order/", response_model=MatchResponse)
-async def change_order(payload: ChangeOrder = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    match_id = payload.match_id
-    new_order = payload.new_order
-    discord_message_id = payload.discord_message_id
-    try:
-        return await svc.change_order(match_id, new_order, discord_message_id)
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid match ID: {match_id}")
-        raise HTTPException(status_code=400, detail="Invalid match ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/delete-pending-match/", response_model=MatchResponse)
-async def delete_pending_match(payload: DeletePendingMatch = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    match_id = payload.match_id
-    try:
-        return await svc.delete_pending_match(match_id)
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid match ID: {match_id}")
-        raise HTTPException(status_code=400, detail="Invalid match ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/trigger-quit/", response_model=MatchResponse)
-async def trigger_quit(payload: TriggerQuit = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    match_id = payload.match_id
-    quitter_discord_id = payload.quitter_discord_id
-    discord_message_id = payload.discord_message_id
-    try:
-        return await svc.trigger_quit(match_id, quitter_discord_id, discord_message_id)
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid quitter discord ID: {match_id}, quitter_discord_id: {quitter_discord_id}")
-        raise HTTPException(status_code=400, detail="Invalid match ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found. matchID: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/assign-discord-id/", response_model=MatchResponse)
-async def assign_discord_id(payload: AssignDiscordId = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    match_id = payload.match_id
-    player_id = payload.player_id
-    player_discord_id = payload.player_discord_id
-    discord_message_id = payload.discord_message_id
-    try:
-        return await svc.assign_discord_id(match_id, player_id, player_discord_id, discord_message_id)
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid player ID: {match_id}, player_id: {player_id}, discord_id: {player_discord_id}")
-        raise HTTPException(status_code=400, detail="Invalid player ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found. matchID: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/assign-discord-id-all/", response_model=MatchResponse)
-async def assign_discord_id_all(payload: AssignDiscordIdAll = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    match_id = payload.match_id
-    discord_id_list = payload.discord_id_list
-    discord_message_id = payload.discord_message_id
-    try:
-        return await svc.assign_discord_id_all(match_id, discord_id_list, discord_message_id)
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid player ID: {match_id}, discord_id_list: {discord_id_list}")
-        raise HTTPException(status_code=400, detail="Invalid player ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found. matchID: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/assign-sub/", response_model=MatchResponse)
-async def assign_sub(payload: AssignSub = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    match_id = payload.match_id
-    sub_in_id = payload.sub_in_id
-    sub_out_discord_id = payload.sub_out_discord_id
-    discord_message_id = payload.discord_message_id
+# Docs-only response schemas: handlers return pre-serialized ORJSONResponse,
+# so these exist purely for OpenAPI and are never validated at runtime.
+MATCH_RESPONSES = {200: {"model": MatchResponse}}
+LEADERBOARD_RESPONSES = {200: {"model": LeaderboardRankingResponse}}
+
+# Look-aside cache keys. Matches are cached by id and deleted on every
+# mutation; leaderboards embed a version counter bumped on approval so stale
+# entries simply expire instead of needing enumeration.
+_LB_VERSION_KEY = "lb:version"
+
+def _match_key(match_id: str) -> str:
+    return f"match:{match_id}"
+
+# The cache is an accelerator, never a dependency: if Redis is down every
+# operation must fall through to Mongo, so all cache traffic funnels through
+# these helpers, which swallow and log connection failures.
+async def _cache_get(cache: Optional[Redis], key: str) -> Optional[bytes]:
+    if cache is None:
+        return None
     try:
-        return await svc.assign_sub(match_id, sub_in_id, sub_out_discord_id, discord_message_id)
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid player ID: {match_id}, sub_in_id: {sub_in_id}, sub_out_discord_id: {sub_out_discord_id}")
-        raise HTTPException(status_code=400, detail="Invalid player ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found. matchID: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/remove-sub/", response_model=MatchResponse)
-async def remove_sub(payload: RemoveSub = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    match_id = payload.match_id
-    sub_out_id = payload.sub_out_id
-    discord_message_id = payload.discord_message_id
+        return await cache.get(key)
+    except Exception as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+
+async def _cache_set(cache: Optional[Redis], key: str, raw: bytes) -> None:
+    if cache is None:
+        return
     try:
-        return await svc.remove_sub(match_id, sub_out_id, discord_message_id)
-    except InvalidIDError:
-        logger.error(f"🔴 Invalid player ID: {match_id}, sub_out_id: {sub_out_id}")
-        raise HTTPException(status_code=400, detail="Invalid player ID")
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found. matchID: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/approve-match/", response_model=MatchResponse)
-async def approve_match(payload: ApproveMatch = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    match_id = payload.match_id
-    approver_discord_id = payload.approver_discord_id
+        await cache.set(key, raw, ex=settings.match_cache_ttl)
+    except Exception as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+async def _bump_lb_version(cache: Optional[Redis]) -> None:
+    if cache is None:
+        return
     try:
-        return await svc.approve_match(match_id, approver_discord_id)
-    except NotFoundError:
-        logger.warning(f"🔴 Match not found. matchID: {match_id}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-
-@router.put("/get-leaderboard-ranking/", response_model=LeaderboardRankingResponse)
-async def get_leaderboard_ranking(payload: GetLeaderboardRequest = Form(), db = Depends(get_database)):
-    svc = MatchService(db)
-    game = payload.game
-    game_type = payload.game_type
-    game_mode = payload.game_mode
-    is_seasonal = payload.is_seasonal
-    is_combined = payload.is_combined
+        await cache.incr(_LB_VERSION_KEY)
+    except Exception as e:
+        logger.warning("Leaderboard version bump failed: %s", e)
+
+async def _invalidate_match(cache: Optional[Redis], match_id: str) -> None:
+    if cache is None:
+        return
     try:
-        return await svc.get_leaderboard(game_type, game, game_mode, is_seasonal, is_combined)
-    except NotFoundError:
-        logger.warning(f"🔴 Invalid game type for leaderboard. game:{game} game_mode:{game_mode}")
-        raise HTTPException(status_code=404, detail="Match not found")
-    except MatchServiceError as e:
-        logger.warning(f"⚠️ Update error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        await cache.delete(_match_key(match_id))
+    except Exception as e:
+        # A missed invalidation only means the entry lives out its TTL; the
+        # mutation itself already succeeded.
+        logger.warning("Cache invalidation failed for match %s: %s", match_id, e)
+
+def _request_ident(kwargs):
+    # Best identifier for the failing request: the match id where there is
+    # one, otherwise the whole payload (e.g. a leaderboard lookup, where
+    # game/game_mode are what make the 404 diagnosable).
+    payload = kwargs.get("payload")
+    match_id = kwargs.get("match_id") or getattr(payload, "match_id", None)
+    return match_id if match_id is not None else repr(payload)
+
+# HTTPException instances are immutable once built, so the two fixed-detail
+# responses are allocated once instead of per failed request.
+_INVALID_ID = HTTPException(status_code=400, detail="Invalid match ID")
+_NOT_FOUND = HTTPException(status_code=404, detail="Match not found")
+
+def translate_errors(fn):
+    """Translate MatchService exceptions to HTTPExceptions in one shared frame.
+
+    Keeps the happy path free of per-route try/except boilerplate and only
+    formats log messages when the failure branch is actually taken.
+    """
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except InvalidIDError:
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error("Invalid match ID: %s", _request_ident(kwargs))
+            raise _INVALID_ID
+        except NotFoundError:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning("Not found: %s", _request_ident(kwargs))
+            raise _NOT_FOUND
+        except MatchServiceError as e:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning("Update error: %s", e)
+            raise HTTPException(status_code=400, detail=str(e))
+    return wrapper
+
+@router.put("/get-match/", responses=MATCH_RESPONSES)
+@translate_errors
+async def get_match(match_id: str = Form(), svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    key = _match_key(match_id)
+    raw = await _cache_get(cache, key)
+    if raw is not None:
+        return Response(raw, media_type="application/json")
+    doc = await svc.get(match_id)
+    raw = orjson.dumps(doc)
+    await _cache_set(cache, key, raw)
+    return Response(raw, media_type="application/json")
+
+@router.put("/append-message-id-list/", responses=MATCH_RESPONSES)
+@translate_errors
+async def append_message_id_list(payload: AppendDiscordMessageID, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    updated = await svc.append_discord_message_id_list(payload.match_id, payload.discord_message_id)
+    await _invalidate_match(cache, payload.match_id)
+    return ORJSONResponse(updated)
+
+@router.put("/update-match/", responses=MATCH_RESPONSES)
+@translate_errors
+async def update_match(payload: MatchUpdate, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    # Walk the fields the client actually sent instead of dict(exclude_unset=True),
+    # which re-encodes every nested PlayerSchema even when untouched.
+    updates = {f: getattr(payload, f) for f in payload.model_fields_set if f not in ("match_id", "op")}
+    if updates.get("players") is not None:
+        updates["players"] = [p.__dict__ for p in updates["players"]]
+    updated = await svc.update(payload.match_id, updates)
+    await _invalidate_match(cache, payload.match_id)
+    return ORJSONResponse(updated)
+
+@router.put("/change-order/", responses=MATCH_RESPONSES)
+@translate_errors
+async def change_order(payload: ChangeOrder, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    updated = await svc.change_order(payload.match_id, payload.new_order, payload.discord_message_id)
+    await _invalidate_match(cache, payload.match_id)
+    return ORJSONResponse(updated)
+
+@router.put("/delete-pending-match/", responses=MATCH_RESPONSES)
+@translate_errors
+async def delete_pending_match(payload: DeletePendingMatch, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    deleted = await svc.delete_pending_match(payload.match_id)
+    await _invalidate_match(cache, payload.match_id)
+    return ORJSONResponse(deleted)
+
+@router.put("/trigger-quit/", responses=MATCH_RESPONSES)
+@translate_errors
+async def trigger_quit(payload: TriggerQuit, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    updated = await svc.trigger_quit(payload.match_id, payload.quitter_discord_id, payload.discord_message_id)
+    await _invalidate_match(cache, payload.match_id)
+    return ORJSONResponse(updated)
+
+@router.put("/assign-discord-id/", responses=MATCH_RESPONSES)
+@translate_errors
+async def assign_discord_id(payload: AssignDiscordId, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    updated = await svc.assign_discord_id(payload.match_id, payload.player_id, payload.player_discord_id, payload.discord_message_id)
+    await _invalidate_match(cache, payload.match_id)
+    return ORJSONResponse(updated)
+
+@router.put("/assign-discord-id-all/", responses=MATCH_RESPONSES)
+@translate_errors
+async def assign_discord_id_all(payload: AssignDiscordIdAll, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    updated = await svc.assign_discord_id_all(payload.match_id, payload.discord_id_list, payload.discord_message_id)
+    await _invalidate_match(cache, payload.match_id)
+    return ORJSONResponse(updated)
+
+@router.put("/assign-sub/", responses=MATCH_RESPONSES)
+@translate_errors
+async def assign_sub(payload: AssignSub, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    updated = await svc.assign_sub(payload.match_id, payload.sub_in_id, payload.sub_out_discord_id, payload.discord_message_id)
+    await _invalidate_match(cache, payload.match_id)
+    return ORJSONResponse(updated)
+
+@router.put("/remove-sub/", responses=MATCH_RESPONSES)
+@translate_errors
+async def remove_sub(payload: RemoveSub, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    updated = await svc.remove_sub(payload.match_id, payload.sub_out_id, payload.discord_message_id)
+    await _invalidate_match(cache, payload.match_id)
+    return ORJSONResponse(updated)
+
+@router.post("/batch-match-ops/")
+@translate_errors
+async def batch_match_ops(ops: List[BatchMatchOp], svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    result = await svc.apply_batch([(o.op, o.payload) for o in ops])
+    if cache is not None:
+        for o in ops:
+            match_id = o.payload.get("match_id")
+            if match_id:
+                await _invalidate_match(cache, match_id)
+    return ORJSONResponse(result)
+
+@router.put("/approve-match/", responses=MATCH_RESPONSES)
+@translate_errors
+async def approve_match(payload: ApproveMatch, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    approved = await svc.approve_match(payload.match_id, payload.approver_discord_id)
+    await _invalidate_match(cache, payload.match_id)
+    # Approval is the only path that touches the stat tables, so it is the
+    # only place the leaderboard version needs bumping.
+    await _bump_lb_version(cache)
+    return ORJSONResponse(approved)
+
+# The per-operation endpoints above each already own their cache invalidation
+# and run under translate_errors, so /mutate/ only has to pick one by payload
+# type after the tagged-union validator has done the discrimination.
+_MUTATION_HANDLERS = {
+    MatchUpdate: update_match,
+    ChangeOrder: change_order,
+    DeletePendingMatch: delete_pending_match,
+    TriggerQuit: trigger_quit,
+    AppendDiscordMessageID: append_message_id_list,
+    AssignDiscordId: assign_discord_id,
+    AssignDiscordIdAll: assign_discord_id_all,
+    AssignSub: assign_sub,
+    RemoveSub: remove_sub,
+    ApproveMatch: approve_match,
+}
+
+@router.put("/mutate/", responses=MATCH_RESPONSES)
+async def mutate(payload: MutationPayload, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    handler = _MUTATION_HANDLERS[type(payload)]
+    return await handler(payload=payload, svc=svc, cache=cache)
+
+@router.put("/get-leaderboard-ranking/", responses=LEADERBOARD_RESPONSES)
+@translate_errors
+async def get_leaderboard_ranking(payload: GetLeaderboardRequest, svc: MatchService = Depends(get_match_service), cache: Optional[Redis] = Depends(get_redis)):
+    key = None
+    if cache is not None:
+        version = await _cache_get(cache, _LB_VERSION_KEY) or b"0"
+        key = f"lb:{payload.game_type}:{payload.game}:{payload.game_mode}:{payload.is_seasonal}:{payload.is_combined}:{version.decode()}"
+        raw = await _cache_get(cache, key)
+        if raw is not None:
+            return Response(raw, media_type="application/json")
+    result = await svc.get_leaderboard(payload.game_type, payload.game, payload.game_mode, payload.is_seasonal, payload.is_combined)
+    raw = orjson.dumps(result)
+    if key is not None:
+        await _cache_set(cache, key, raw)
+    return Response(raw, media_type="application/json")
@@ -1,6 +1,6 @@
 import logging
 from fastapi import APIRouter, File, Form, UploadFile, Depends, HTTPException
-from app.dependencies import get_database
+from app.dependencies import get_match_service
 from app.services.match_service import MatchService, ParseError
 
 logger = logging.getLogger(__name__)
@@ -12,14 +12,13 @@ async def upload_game_report(
     reporter_discord_id: str = Form(...),
     is_cloud: str = Form(...),
     discord_message_id: str = Form(...),
-    db = Depends(get_database),
+    svc: MatchService = Depends(get_match_service),
 ):
     raw = await file.read()
     is_cloud_game = is_cloud == '1'
-    svc = MatchService(db)
     try:
         created = await svc.create_from_save(raw, reporter_discord_id, is_cloud_game, discord_message_id)
-        logger.info(f"✅ Stored match {created['match_id']}")
+        logger.info("✅ Stored match %s", created['match_id'])
         return created
     except ParseError as e:
         logger.error("🔴 Unrecognized save file format")
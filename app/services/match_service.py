@@ -1,18 +1,19 @@
 import logging
-from collections import defaultdict
 from typing import Any, Dict, List
 from bson import ObjectId
 from bson.int64 import Int64
+from pymongo import DeleteOne, ReplaceOne, ReturnDocument, UpdateOne
 from app.parsers import parse_civ7_save, parse_civ6_save  # do not modify parser code
 from app.utils import get_cpl_name
 from app.config import settings
-from app.models.db_models import MatchModel, StatModel, PlayerModel
+from app.models.db_models import MatchModel, StatModel, PlayerModel, STAT_FIELDS
+from app.models.schemas import MatchUpdate
 from trueskill import Rating
 from app.services.skill import make_ts_env
 import hashlib
+from base64 import b64encode
 import asyncio
-from datetime import datetime, UTC
-import copy
+from datetime import datetime, timedelta, UTC
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,23 @@ class InvalidIDError(MatchServiceError): ...
 class ParseError(MatchServiceError): ...
 class NotFoundError(MatchServiceError): ...
 
-approve_lock = asyncio.Lock()
+# Fields a batch "update" op may $set: the same mutable fields the typed
+# MatchUpdate body allows, so the batch path cannot write anything the
+# single-op path could not.
+_BATCH_UPDATE_FIELDS = frozenset(MatchUpdate.model_fields) - {"op", "match_id"}
+
+# How long an approval claim is honoured before another attempt may steal it.
+# Generous compared to the seconds an approval takes, but short enough that a
+# worker dying mid-approval does not leave the match stuck.
+APPROVE_CLAIM_TIMEOUT_S = 120
+
+# Magic-prefix dispatch for save parsers; extending to a new game is one
+# entry here rather than another elif arm.
+_PARSER_BY_MAGIC = {
+    b'CIV6': parse_civ6_save,
+    b'CIV7': parse_civ7_save,
+}
+
 class MatchService:
     def __init__(self, db):
         self.db = db
@@ -34,6 +51,35 @@ class MatchService:
         self.civ6_seasonal_stats = db["civ6_season_stats"]
         self.civ7_seasonal_stats = db["civ7_season_stats"]
 
+    async def ensure_indexes(self) -> None:
+        """Create the indexes the hot queries rely on.
+
+        create_index is a no-op when the index already exists, so this is safe
+        to run on every startup. The dedup check hits save_file_hash, the id
+        mapping helpers hit steam_id/discord_id, and every leaderboard query
+        filters on games and sorts on (mu desc, sigma asc).
+        """
+        # Sort keys first, range predicate last (ESR): the leaderboard filters
+        # games with $gt but sorts on (mu desc, sigma asc), so mu/sigma must
+        # lead for the planner to stream in sort order and stop at the limit
+        # instead of top-k sorting every qualifying row in memory.
+        lb_key = [("mu", -1), ("sigma", 1), ("games", 1)]
+        tasks = [
+            # Not unique: the find_one dedup check is the semantic guard, and
+            # a unique build would refuse to create over any duplicates the
+            # old racy read-then-insert path already let in, besides turning
+            # the remaining insert race into a raw DuplicateKeyError.
+            self.pending_matches.create_index("save_file_hash"),
+            self.players.create_index("discord_id"),
+            self.players.create_index("steam_id"),
+        ]
+        for stats_db in (self.civ6_lifetime_stats, self.civ7_lifetime_stats,
+                         self.civ6_seasonal_stats, self.civ7_seasonal_stats):
+            for prefix in ("pbc_", "rt_"):
+                for mode in ("duel", "ffa", "teamer", "combined"):
+                    tasks.append(getattr(stats_db, prefix + mode).create_index(lb_key))
+        await asyncio.gather(*tasks)
+
     @staticmethod
     def _to_oid(match_id: str) -> ObjectId:
         try:
@@ -41,37 +87,86 @@ class MatchService:
         except Exception:
             raise InvalidIDError("Invalid match ID")
 
+    @staticmethod
+    def _epoch_ms(dt: datetime) -> int:
+        # Mongo hands back naive datetimes that are UTC by convention.
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=UTC)
+        return int(dt.timestamp() * 1000)
+
+    @classmethod
+    def _convert_times(cls, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Swap datetime fields for epoch-ms ints on the wire.
+
+        Clients format timestamps locally; sending ints skips per-field ISO
+        formatting and parsing on both ends. Mongo keeps native BSON
+        datetimes so index sorts and existing data are untouched.
+        """
+        created = doc.pop("created_at", None)
+        if created is not None:
+            doc["created_at_ms"] = cls._epoch_ms(created)
+        approved = doc.pop("approved_at", None)
+        doc["approved_at_ms"] = cls._epoch_ms(approved) if approved is not None else None
+        return doc
+
+    @staticmethod
+    def _encode_save_file_hash(doc: Dict[str, Any]) -> Dict[str, Any]:
+        # Raw digest bytes are not JSON-serializable; every dict that leaves
+        # the service must go through this.
+        sfh = doc.get("save_file_hash")
+        if isinstance(sfh, (bytes, bytearray)):
+            doc["save_file_hash"] = b64encode(sfh).decode("ascii")
+        return doc
+
+    @classmethod
+    def _to_response(cls, doc: Dict[str, Any]) -> Dict[str, Any]:
+        doc["match_id"] = str(doc.pop("_id"))
+        cls._encode_save_file_hash(doc)
+        return cls._convert_times(doc)
+
     @staticmethod
     def _parse_save(file_bytes: bytes) -> Dict[str, Any]:
-        if file_bytes.startswith(b'CIV6'):
-            parser = parse_civ6_save
-        elif file_bytes.startswith(b'CIV7'):
-            parser = parse_civ7_save
-        else:
+        parser = _PARSER_BY_MAGIC.get(file_bytes[:4])
+        if parser is None:
             raise ParseError(f"Unrecognized save file format. starts with {file_bytes[:4]!r}")
         try:
             data = parser(file_bytes, settings.civ_save_parser_version)
-            logger.info(f"✅ 🔍 Parsed as {data.get('game')}")
+            logger.info("✅ 🔍 Parsed as %s", data.get('game'))
             return data
         except Exception as e:
             raise ParseError(f"⚠️ Parse attempt failed: {e}")
         
     async def discord_to_steam_id(self, discord_id: str) -> str:
-        player = await self.players.find_one({"discord_id": f"{discord_id}"})
+        player = await self.players.find_one({"discord_id": f"{discord_id}"}, {"steam_id": 1})
         if player:
             return player.get("steam_id")
         return None
 
     async def steam_to_discord_id(self, steam_id: str) -> str:
-        player = await self.players.find_one({"steam_id": f"{steam_id}"})
+        player = await self.players.find_one({"steam_id": f"{steam_id}"}, {"discord_id": 1})
         if player:
             return player.get("discord_id")
         return None
 
+    async def discord_to_steam_ids(self, discord_ids: List[str]) -> Dict[str, str]:
+        """Resolve many discord_id -> steam_id mappings in one $in query."""
+        by_discord: Dict[str, str] = {}
+        async for doc in self.players.find({"discord_id": {"$in": discord_ids}}, {"discord_id": 1, "steam_id": 1}):
+            by_discord[doc["discord_id"]] = doc.get("steam_id")
+        return by_discord
+
     async def match_id_to_discord(self, match):
+        """Resolve steam_id -> discord_id for a whole match in one $in query
+        instead of one find_one round-trip per player."""
+        steam_ids = [p.steam_id for p in match.players if p.steam_id and p.steam_id != '-1']
+        if not steam_ids:
+            return match
+        by_steam = {}
+        async for doc in self.players.find({"steam_id": {"$in": steam_ids}}, {"steam_id": 1, "discord_id": 1}):
+            by_steam[doc["steam_id"]] = doc.get("discord_id")
         for player in match.players:
             if player.steam_id and player.steam_id != '-1':
-                player.discord_id = await self.steam_to_discord_id(player.steam_id)
+                player.discord_id = by_steam.get(player.steam_id)
         return match
 
     def get_stat_table(self, is_cloud: bool, match_type: str, civ_version: str, is_seasonal: bool = False, is_combined: bool = False):
@@ -89,96 +184,141 @@ class MatchService:
         return getattr(db, match_table)
 
     def get_player_stats_db(self, match, player, player_new_stats: StatModel, delta_value_name: str) -> Dict[str, Any]:
-        player_stats_db = {}
-        player_stats_db[f"mu"] = player_new_stats.mu
-        player_stats_db[f"sigma"] = player_new_stats.sigma
-        player_stats_db[f"games"] = player_new_stats.games + 1
-        player_stats_db[f"wins"] = player_new_stats.wins + (1 if getattr(player, delta_value_name) > 0 else 0)
-        player_stats_db[f"first"] = player_new_stats.first + (1 if player.placement == 0 else 0)
-        player_stats_db[f"subbedIn"] = player_new_stats.subbedIn + (1 if player.is_sub else 0)
-        player_stats_db[f"subbedOut"] = player_new_stats.subbedOut + (1 if player.subbed_out else 0)
-        player_stats_db[f"lastModified"] = datetime.now(UTC)
+        player_stats_db = {
+            "mu": player_new_stats.mu,
+            "sigma": player_new_stats.sigma,
+            "games": player_new_stats.games + 1,
+            "wins": player_new_stats.wins + (1 if getattr(player, delta_value_name) > 0 else 0),
+            "first": player_new_stats.first + (1 if player.placement == 0 else 0),
+            "subbedIn": player_new_stats.subbedIn + (1 if player.is_sub else 0),
+            "subbedOut": player_new_stats.subbedOut + (1 if player.subbed_out else 0),
+            "lastModified": datetime.now(UTC),
+        }
         if player.civ:
-            civs = player_new_stats.civs
+            # Copy instead of mutating the StatModel's dict in place: the same
+            # row can back several write docs, and in-place bumps would
+            # double-count the civ across them.
+            civs = {**player_new_stats.civs} if player_new_stats.civs else {}
             player_civ_leader = get_cpl_name(match.game, player.civ, player.leader)
             civs[player_civ_leader] = civs.get(player_civ_leader, 0) + 1
-            player_stats_db[f"civs"] = civs
+            player_stats_db["civs"] = civs
         return player_stats_db
 
-    async def get_player_ranking(self, match: MatchModel, discord_id: str, player_index: int, is_seasonal: bool, is_combined: bool) -> StatModel:
-        if discord_id == None:
-            return StatModel(
-                index=player_index,
-                id=0,
-                mu=settings.ts_mu,
-                sigma=settings.ts_sigma,
-                games=0,
-                wins=0,
-                first=0,
-                subbedIn=0,
-                subbedOut=0,
-                civs={},
-            )
-        stat_table = self.get_stat_table(match.is_cloud, match.game_mode, match.game, is_seasonal, is_combined)
-        player = await stat_table.find_one({"_id": Int64(discord_id)})
-        if player:
-            player['id'] = player.pop('_id')
-            player['index'] = player_index
-            return StatModel(**player)
-        else:
-            return StatModel(
-                index=player_index,
-                id=discord_id,
-                mu=settings.ts_mu,
-                sigma=settings.ts_sigma,
-                games=0,
-                wins=0,
-                first=0,
-                subbedIn=0,
-                subbedOut=0,
-                civs={},
-            )
+    @staticmethod
+    def _default_stat(player_index: int, discord_id) -> StatModel:
+        return StatModel(
+            index=player_index,
+            id=int(discord_id) if discord_id is not None else 0,
+            mu=settings.ts_mu,
+            sigma=settings.ts_sigma,
+            games=0,
+            wins=0,
+            first=0,
+            subbedIn=0,
+            subbedOut=0,
+            civs={},
+        )
 
     async def get_players_ranking(self, match: MatchModel, is_seasonal: bool = False, is_combined: bool = False) -> List[StatModel]:
+        """Fetch stat rows for every linked player in one $in query.
+
+        One round-trip per stat table instead of one find_one per player;
+        players without a linked discord_id or without a stored row fall back
+        to the default StatModel.
+        """
+        stat_table = self.get_stat_table(match.is_cloud, match.game_mode, match.game, is_seasonal, is_combined)
+        ids = [Int64(p.discord_id) for p in match.players if p.discord_id is not None]
+        rows: Dict[Any, Dict[str, Any]] = {}
+        if ids:
+            async for doc in stat_table.find({"_id": {"$in": ids}}):
+                rows[doc["_id"]] = doc
         players_ranking = []
         for player_index, player in enumerate(match.players):
-            ranking = await self.get_player_ranking(match, player.discord_id, player_index, is_seasonal, is_combined)
-            players_ranking.append(ranking)
+            row = rows.get(Int64(player.discord_id)) if player.discord_id is not None else None
+            if row is not None:
+                stats = {k: v for k, v in row.items() if k in STAT_FIELDS}
+                stats["id"] = row["_id"]
+                stats["index"] = player_index
+                players_ranking.append(StatModel(**stats))
+            else:
+                players_ranking.append(self._default_stat(player_index, player.discord_id))
         return players_ranking
 
-    def update_player_stats(self, match: MatchModel, players_ranking: List[StatModel], delta_value_name: str):
+    @staticmethod
+    def _rating_signature(match: MatchModel) -> tuple:
+        """The inputs the TrueSkill recompute actually depends on.
+
+        Mutations that leave this unchanged (re-assigning the same discord id,
+        re-submitting the current player order) can skip the three-scope
+        rating pass entirely — the deltas would come out identical.
+        """
+        return tuple((p.team, p.placement, p.discord_id, p.is_sub, p.subbed_out) for p in match.players)
+
+    def update_player_stats(self, match: MatchModel, rankings_by_scope: List[List[StatModel]], delta_value_names: List[str]):
+        """Run the TrueSkill update for every stat scope in one pass.
+
+        Team partitioning, placement extraction and the sub/subbed-out
+        bookkeeping depend only on the match, so they are computed once and
+        shared across the lifetime/seasonal/combined scopes; only the Rating
+        construction and env.rate calls repeat per scope. Returns the match
+        and one post-state list per scope, or (None, None) for matches with
+        fewer than two teams.
+        """
         num_teams = len(set([p.team for p in match.players]))
         if num_teams <= 1:
-            print(f"Skipping match with less than 2 teams. Validation Msg ID: {match.validation_msg_id}")
+            logger.debug("Skipping match with less than 2 teams. Message IDs: %s", match.discord_messages_id_list)
             return None, None
-        teams_wo_subs = defaultdict(list)
-        teams_with_sub_ins = defaultdict(list)
+        # Single traversal builds both groupings (per-team player-index lists,
+        # keyed by insertion order) and their placement arrays. Subs only
+        # belong to the with-sub-ins view, subbed-out players only to the
+        # without-subs view, everyone else to both.
+        by_team_wo_subs: Dict[int, List[int]] = {}
+        by_team_with_sub_ins: Dict[int, List[int]] = {}
+        placements_wo_subs: List[int] = []
+        placements_with_sub_ins: List[int] = []
         for i, p in enumerate(match.players):
-            if p.is_sub:
-                teams_with_sub_ins[p.team].append((i, p))
-            elif p.subbed_out:
-                teams_wo_subs[p.team].append((i, p))
-            else:
-                teams_wo_subs[p.team].append((i, p))
-                teams_with_sub_ins[p.team].append((i, p))
+            if not p.is_sub:
+                bucket = by_team_wo_subs.get(p.team)
+                if bucket is None:
+                    by_team_wo_subs[p.team] = [i]
+                    placements_wo_subs.append(p.placement)
+                else:
+                    bucket.append(i)
+            if p.is_sub or not p.subbed_out:
+                bucket = by_team_with_sub_ins.get(p.team)
+                if bucket is None:
+                    by_team_with_sub_ins[p.team] = [i]
+                    placements_with_sub_ins.append(p.placement)
+                else:
+                    bucket.append(i)
+        teams_wo_subs = list(by_team_wo_subs.values())
+        teams_with_sub_ins = list(by_team_with_sub_ins.values())
+
+        ts_env = make_ts_env()
+        posts: List[List[StatModel]] = []
+        for players_ranking, delta_value_name in zip(rankings_by_scope, delta_value_names):
+            posts.append(self._rate_scope(
+                match, players_ranking, delta_value_name, ts_env,
+                teams_wo_subs, teams_with_sub_ins,
+                placements_wo_subs, placements_with_sub_ins,
+            ))
+        return match, posts
+
+    def _rate_scope(self, match, players_ranking, delta_value_name, ts_env,
+                    teams_wo_subs, teams_with_sub_ins,
+                    placements_wo_subs, placements_with_sub_ins) -> List[StatModel]:
         team_wo_subs_states: List[List[StatModel]] = [
-            [players_ranking[p_index_tuple[0]] for p_index_tuple in teams_wo_subs[team]] for team in teams_wo_subs
+            [players_ranking[i] for i in team] for team in teams_wo_subs
         ]
         team_with_sub_ins_states: List[List[StatModel]] = [
-            [players_ranking[p_index_tuple[0]] for p_index_tuple in teams_with_sub_ins[team]] for team in teams_with_sub_ins
+            [players_ranking[i] for i in team] for team in teams_with_sub_ins
         ]
 
         ts_teams_wo_subs = [[Rating(p.mu, p.sigma) for p in team] for team in team_wo_subs_states]
         ts_teams_with_sub_ins = [[Rating(p.mu, p.sigma) for p in team] for team in team_with_sub_ins_states]
-        
-        placements_wo_subs = [teams_wo_subs[team][0][1].placement for team in teams_wo_subs]
-        placements_with_sub_ins = [teams_with_sub_ins[team][0][1].placement for team in teams_with_sub_ins]
 
-        ts_wo_subs_env = make_ts_env()
-        ts_with_sub_ins_env = make_ts_env()
-        
-        new_ts_wo_subs = ts_wo_subs_env.rate(ts_teams_wo_subs, ranks=placements_wo_subs)
-        new_ts_with_sub_ins = ts_with_sub_ins_env.rate(ts_teams_with_sub_ins, ranks=placements_with_sub_ins)
+        new_ts_wo_subs = ts_env.rate(ts_teams_wo_subs, ranks=placements_wo_subs)
+        new_ts_with_sub_ins = ts_env.rate(ts_teams_with_sub_ins, ranks=placements_with_sub_ins)
 
         post: List[StatModel] = list(range(len(match.players)))
         for team_idx, team in enumerate(team_wo_subs_states):
@@ -214,36 +354,40 @@ class MatchService:
                         subbedOut=player.subbedOut,
                         civs=player.civs,
                     )
+        min_sub_delta = settings.min_points_for_subs
         for i, p in enumerate(match.players):
-            p_current_ranking = players_ranking[i]
-            delta = round(post[i].mu - p_current_ranking.mu) if p.discord_id != None else 0
+            pre_mu = players_ranking[i].mu
+            delta = round(post[i].mu - pre_mu) if p.discord_id is not None else 0
             if p.is_sub:
-                # Subbed in player
-                p.__setattr__(delta_value_name, max(settings.min_points_for_subs, delta))
+                # Subbed-in players get a floor on their loss.
+                delta = max(min_sub_delta, delta)
             elif p.subbed_out:
-                # Subbed out Player
-                p.__setattr__(delta_value_name, delta if delta < 0 else 0)
-            else:
-                # Regular player
-                p.__setattr__(delta_value_name, delta)
-            post[i].mu = p_current_ranking.mu + getattr(p, delta_value_name)
-        return match, post
+                # Subbed-out players never gain.
+                delta = min(delta, 0)
+            setattr(p, delta_value_name, delta)
+            post[i].mu = pre_mu + delta
+        return post
 
     async def create_from_save(self, file_bytes: bytes, reporter_discord_id: str, is_cloud: bool, discord_message_id: str) -> Dict[str, Any]:
-        parsed = self._parse_save(file_bytes)
-        m = hashlib.sha256()
-        unique_data = ','.join(
-            [parsed['game']] + 
-            [parsed['map_type']] +
-            [p['civ'] + (p['leader'] if 'leader' in p else '') for p in parsed['players']]
-        )
-        m.update(unique_data.encode('utf-8'))
-        save_file_hash = m.hexdigest()
+        # Saves run to several MB and the parsers are pure CPU; off the event
+        # loop they stop stalling every other in-flight request.
+        parsed = await asyncio.to_thread(self._parse_save, file_bytes)
+        # Dedup fingerprint, not a security boundary: blake2b at 16 bytes is
+        # faster than sha256 and plenty of collision margin for the pending
+        # window. Fields are fed to the hasher directly (NUL-separated)
+        # instead of building a joined intermediate string first. Stored as
+        # raw digest bytes (BSON BinData).
+        m = hashlib.blake2b(digest_size=16)
+        m.update(parsed['game'].encode('utf-8'))
+        m.update(b'\x00')
+        m.update(parsed['map_type'].encode('utf-8'))
+        for p in parsed['players']:
+            m.update(b'\x00')
+            m.update((p['civ'] + (p['leader'] if 'leader' in p else '')).encode('utf-8'))
+        save_file_hash = m.digest()
         res = await self.pending_matches.find_one({"save_file_hash": save_file_hash})
         if res:
-            match_id = str(res["_id"])
-            del res["_id"]
-            res["match_id"] = match_id
+            self._to_response(res)
             res['repeated'] = True
             return res
         parsed['save_file_hash'] = save_file_hash
@@ -251,47 +395,99 @@ class MatchService:
         parsed['reporter_discord_id'] = reporter_discord_id
         parsed['is_cloud'] = is_cloud
         parsed['discord_messages_id_list'] = [discord_message_id]
-        match = MatchModel(**parsed)
+        match = MatchModel.model_validate(parsed)
         match = await self.match_id_to_discord(match)
-        players_ranking = await self.get_players_ranking(match)
-        players_season_ranking = await self.get_players_ranking(match, is_seasonal=True)
-        players_combined_ranking = await self.get_players_ranking(match, is_combined=True)
-        match, _ = self.update_player_stats(match, players_ranking, "delta")
-        match, _ = self.update_player_stats(match, players_season_ranking, "season_delta")
-        match, _ = self.update_player_stats(match, players_combined_ranking, "combined_delta")
-        res = await self.pending_matches.insert_one(match.dict())
-        return {"match_id": str(res.inserted_id), **match.dict()}
+        players_ranking, players_season_ranking, players_combined_ranking = await asyncio.gather(
+            self.get_players_ranking(match),
+            self.get_players_ranking(match, is_seasonal=True),
+            self.get_players_ranking(match, is_combined=True),
+        )
+        match, _ = await asyncio.to_thread(
+            self.update_player_stats,
+            match,
+            [players_ranking, players_season_ranking, players_combined_ranking],
+            ["delta", "season_delta", "combined_delta"],
+        )
+        res = await self.pending_matches.insert_one(match.model_dump())
+        return self._convert_times(self._encode_save_file_hash({"match_id": str(res.inserted_id), **match.model_dump()}))
     
     async def append_discord_message_id_list(self, match_id: str, discord_message_id_list: list[str]) -> Dict[str, Any]:
         oid = self._to_oid(match_id)
-        res = await self.pending_matches.find_one({"_id": oid})
-        if not res:
+        # $push/$each appends server-side in one round-trip; the old
+        # fetch-concat-set pair could drop ids under concurrent appends.
+        updated = await self.pending_matches.find_one_and_update(
+            {"_id": oid},
+            {"$push": {"discord_messages_id_list": {"$each": discord_message_id_list}}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if updated is None:
             raise NotFoundError("Match not found")
-        current_list = res.get("discord_messages_id_list", [])
-        updated_list = current_list + discord_message_id_list
-        await self.pending_matches.update_one({"_id": oid}, {"$set": {"discord_messages_id_list": updated_list}})
-        updated = await self.pending_matches.find_one({"_id": oid})
-        updated["match_id"] = str(updated.pop("_id"))
+        self._to_response(updated)
         return updated
 
+    async def apply_batch(self, ops: List[tuple]) -> Dict[str, Any]:
+        """Fan a burst of simple match operations into one bulk_write.
+
+        Each op is an ("update" | "append_message_id" | "delete", payload)
+        pair; payloads carry a match_id plus op-specific fields. The whole
+        batch goes to Mongo as a single unordered command.
+        """
+        requests = []
+        for op, payload in ops:
+            oid = self._to_oid(payload.get("match_id", ""))
+            if op == "update":
+                changes = payload.get("changes") or {}
+                if not changes:
+                    raise MatchServiceError("Empty update payload in batch")
+                # Batch payloads arrive as raw dicts; hold them to the same
+                # contract as the typed single-op body, otherwise one batch
+                # could $set arbitrary fields/types and brick the match for
+                # every later MatchModel.model_validate.
+                unknown = set(changes) - _BATCH_UPDATE_FIELDS
+                if unknown:
+                    raise MatchServiceError(f"Unsupported fields in batch update: {', '.join(sorted(unknown))}")
+                try:
+                    validated = MatchUpdate.model_validate({"match_id": payload.get("match_id", ""), **changes})
+                except ValueError as e:
+                    raise MatchServiceError(f"Invalid batch update payload: {e}")
+                changes = {f: getattr(validated, f) for f in changes}
+                if changes.get("players") is not None:
+                    changes["players"] = [p.__dict__ for p in changes["players"]]
+                requests.append(UpdateOne({"_id": oid}, {"$set": changes}))
+            elif op == "append_message_id":
+                ids = payload.get("discord_message_id") or []
+                if not ids:
+                    raise MatchServiceError("Empty discord_message_id in batch")
+                requests.append(UpdateOne({"_id": oid}, {"$push": {"discord_messages_id_list": {"$each": ids}}}))
+            else:  # delete
+                requests.append(DeleteOne({"_id": oid}))
+        if not requests:
+            raise MatchServiceError("Empty batch")
+        res = await self.pending_matches.bulk_write(requests, ordered=False)
+        logger.info("✅ 🔄 Batch of %d ops applied", len(requests))
+        return {
+            "matched": res.matched_count,
+            "modified": res.modified_count,
+            "deleted": res.deleted_count,
+        }
+
     async def get(self, match_id: str) -> Dict[str, Any]:
         oid = self._to_oid(match_id)
         doc = await self.pending_matches.find_one({"_id": oid})
         if not doc:
             raise NotFoundError("Match not found")
-        doc["match_id"] = str(doc.pop("_id"))
+        self._to_response(doc)
         return doc
 
     async def update(self, match_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         if not update_data:
             raise MatchServiceError("Empty update payload")
         oid = self._to_oid(match_id)
-        res = await self.pending_matches.update_one({"_id": oid}, {"$set": update_data})
-        if res.matched_count == 0:
+        updated = await self.pending_matches.find_one_and_update({"_id": oid}, {"$set": update_data}, return_document=ReturnDocument.AFTER)
+        if updated is None:
             raise NotFoundError("Match not found")
-        updated = await self.pending_matches.find_one({"_id": oid})
-        updated["match_id"] = str(updated.pop("_id"))
-        logger.info(f"✅ 🔄 Updated match {match_id}")
+        self._to_response(updated)
+        logger.info("✅ 🔄 Updated match %s", match_id)
         return updated
 
     async def change_order(self, match_id: str, new_order: str, discord_message_id: str) -> Dict[str, Any]:
@@ -299,57 +495,78 @@ class MatchService:
         res = await self.pending_matches.find_one({"_id": oid})
         if res == None:
             raise NotFoundError("Match not found")
-        match = MatchModel(**res)
+        match = MatchModel.model_validate(res)
         num_teams = len({player.team for player in match.players})
         new_order_list = new_order.split(' ')
         if len(new_order_list) != num_teams:
             raise MatchServiceError(f"New order length does not match number of players/teams ({num_teams})")
+        signature = self._rating_signature(match)
         for i, player in enumerate(match.players):
             player.placement = int(new_order_list[player.team]) - 1
-        players_ranking = await self.get_players_ranking(match)
-        players_season_ranking = await self.get_players_ranking(match, is_seasonal=True)
-        players_combined_ranking = await self.get_players_ranking(match, is_combined=True)
-        match, _ = self.update_player_stats(match, players_ranking, "delta")
-        match, _ = self.update_player_stats(match, players_season_ranking, "season_delta")
-        match, _ = self.update_player_stats(match, players_combined_ranking, "combined_delta")
         changes = {}
-        changes["discord_messages_id_list"] = res['discord_messages_id_list'] + [discord_message_id]
         for i, player in enumerate(match.players):
             changes[f"players.{i}.placement"] = player.placement
-            changes[f"players.{i}.delta"] = match.players[i].delta
-            changes[f"players.{i}.season_delta"] = match.players[i].season_delta
-            changes[f"players.{i}.combined_delta"] = match.players[i].combined_delta
-        await self.pending_matches.update_one({"_id": oid}, {"$set": changes})
-        logger.info(f"✅ 🔄 Changed player order for match {match_id}")
-        updated = await self.pending_matches.find_one({"_id": oid})
-        updated["match_id"] = str(updated.pop("_id"))
+        if self._rating_signature(match) != signature:
+            players_ranking, players_season_ranking, players_combined_ranking = await asyncio.gather(
+                self.get_players_ranking(match),
+                self.get_players_ranking(match, is_seasonal=True),
+                self.get_players_ranking(match, is_combined=True),
+            )
+            match, _ = await asyncio.to_thread(
+                self.update_player_stats,
+                match,
+                [players_ranking, players_season_ranking, players_combined_ranking],
+                ["delta", "season_delta", "combined_delta"],
+            )
+            for i, player in enumerate(match.players):
+                changes[f"players.{i}.delta"] = match.players[i].delta
+                changes[f"players.{i}.season_delta"] = match.players[i].season_delta
+                changes[f"players.{i}.combined_delta"] = match.players[i].combined_delta
+        updated = await self.pending_matches.find_one_and_update(
+            {"_id": oid},
+            {"$set": changes, "$push": {"discord_messages_id_list": discord_message_id}},
+            return_document=ReturnDocument.AFTER,
+        )
+        logger.info("✅ 🔄 Changed player order for match %s", match_id)
+        self._to_response(updated)
         return updated
 
     async def delete_pending_match(self, match_id: str) -> Dict[str, Any]:
         oid = self._to_oid(match_id)
-        res = await self.pending_matches.find_one({"_id": oid})
-        if res == None:
+        # The deleted doc is the response body, so the find and the delete
+        # collapse into one find_one_and_delete round-trip; a separate
+        # existence check would fetch the whole players array twice.
+        res = await self.pending_matches.find_one_and_delete({"_id": oid})
+        if res is None:
             raise NotFoundError("Match not found")
-        res["match_id"] = str(res.pop("_id"))
-        await self.pending_matches.delete_one({"_id": oid})
-        logger.info(f"✅ 🔄 Match {match_id} removed")
+        self._to_response(res)
+        logger.info("✅ 🔄 Match %s removed", match_id)
         return res
 
     async def trigger_quit(self, match_id: str, quitter_discord_id: str, discord_message_id: str) -> Dict[str, Any]:
         oid = self._to_oid(match_id)
-        res = await self.pending_matches.find_one({"_id": oid})
-        if res == None:
+        # Pipeline update: the quit toggle and the message-id append both run
+        # server-side in one round-trip, so there is no fetch of the full
+        # document and no read-toggle-write race on the quit flag.
+        pipeline = [
+            {"$set": {
+                "players": {"$map": {
+                    "input": "$players",
+                    "as": "p",
+                    "in": {"$cond": [
+                        {"$eq": ["$$p.discord_id", quitter_discord_id]},
+                        {"$mergeObjects": ["$$p", {"quit": {"$not": ["$$p.quit"]}}]},
+                        "$$p",
+                    ]},
+                }},
+                "discord_messages_id_list": {"$concatArrays": ["$discord_messages_id_list", [discord_message_id]]},
+            }},
+        ]
+        updated = await self.pending_matches.find_one_and_update({"_id": oid}, pipeline, return_document=ReturnDocument.AFTER)
+        if updated is None:
             raise NotFoundError("Match not found")
-        changes = {}
-        for i, player in enumerate(res['players']):
-            if player.get('discord_id') == quitter_discord_id:
-                changes[f"players.{i}.quit"] = False if res['players'][i]['quit'] else True
-                break
-        changes["discord_messages_id_list"] = res['discord_messages_id_list'] + [discord_message_id]
-        await self.pending_matches.update_one({"_id": oid}, {"$set": changes})
-        updated = await self.pending_matches.find_one({"_id": oid})
-        updated["match_id"] = str(updated.pop("_id"))
-        logger.info(f"✅ 🔄 Match {match_id}, player {quitter_discord_id} quit triggered")
+        self._to_response(updated)
+        logger.info("✅ 🔄 Match %s, player %s quit triggered", match_id, quitter_discord_id)
         return updated
 
     async def assign_discord_id(self, match_id: str, player_id: str, player_discord_id: str, discord_message_id: str) -> Dict[str, Any]:
@@ -357,30 +574,38 @@ class MatchService:
         res = await self.pending_matches.find_one({"_id": oid})
         if res == None:
             raise NotFoundError("Match not found")
-        match = MatchModel(**res)
+        match = MatchModel.model_validate(res)
         if int(player_id) < 1 or int(player_id) > len(match.players):
             raise MatchServiceError("Player ID out of range. Must be between 1 and number of players")
+        signature = self._rating_signature(match)
         match.players[int(player_id)-1].discord_id = player_discord_id
         match.players[int(player_id)-1].steam_id = await self.discord_to_steam_id(player_discord_id)
-        players_ranking = await self.get_players_ranking(match)
-        print(match.is_cloud, match.game_mode, match.game)
-        players_season_ranking = await self.get_players_ranking(match, is_seasonal=True)
-        players_combined_ranking = await self.get_players_ranking(match, is_combined=True)
-        match, _ = self.update_player_stats(match, players_ranking, "delta")
-        match, _ = self.update_player_stats(match, players_season_ranking, "season_delta")
-        match, _ = self.update_player_stats(match, players_combined_ranking, "combined_delta")
         changes = {}
-        changes["discord_messages_id_list"] = res['discord_messages_id_list'] + [discord_message_id]
         changes[f"players.{int(player_id)-1}.discord_id"] = player_discord_id
         changes[f"players.{int(player_id)-1}.steam_id"] = match.players[int(player_id)-1].steam_id
-        for i, player in enumerate(res['players']):
-            changes[f"players.{i}.delta"] = match.players[i].delta
-            changes[f"players.{i}.season_delta"] = match.players[i].season_delta
-            changes[f"players.{i}.combined_delta"] = match.players[i].combined_delta
-        await self.pending_matches.update_one({"_id": oid}, {"$set": changes})
-        logger.info(f"✅ 🔄 Assigned player id for match {match_id}")
-        updated = await self.pending_matches.find_one({"_id": oid})
-        updated["match_id"] = str(updated.pop("_id"))
+        if self._rating_signature(match) != signature:
+            players_ranking, players_season_ranking, players_combined_ranking = await asyncio.gather(
+                self.get_players_ranking(match),
+                self.get_players_ranking(match, is_seasonal=True),
+                self.get_players_ranking(match, is_combined=True),
+            )
+            match, _ = await asyncio.to_thread(
+                self.update_player_stats,
+                match,
+                [players_ranking, players_season_ranking, players_combined_ranking],
+                ["delta", "season_delta", "combined_delta"],
+            )
+            for i, player in enumerate(res['players']):
+                changes[f"players.{i}.delta"] = match.players[i].delta
+                changes[f"players.{i}.season_delta"] = match.players[i].season_delta
+                changes[f"players.{i}.combined_delta"] = match.players[i].combined_delta
+        updated = await self.pending_matches.find_one_and_update(
+            {"_id": oid},
+            {"$set": changes, "$push": {"discord_messages_id_list": discord_message_id}},
+            return_document=ReturnDocument.AFTER,
+        )
+        logger.info("✅ 🔄 Assigned player id for match %s", match_id)
+        self._to_response(updated)
         return updated
 
     async def assign_discord_id_all(self, match_id: str, player_discord_id: List[str], discord_message_id: str) -> Dict[str, Any]:
@@ -388,31 +613,41 @@ class MatchService:
         res = await self.pending_matches.find_one({"_id": oid})
         if res == None:
             raise NotFoundError("Match not found")
-        match = MatchModel(**res)
+        match = MatchModel.model_validate(res)
         if len(player_discord_id) != len(match.players):
             raise MatchServiceError("Number of given players does not match number of players in match.")
+        signature = self._rating_signature(match)
+        by_discord = await self.discord_to_steam_ids(player_discord_id)
         for player_id, discord_id in enumerate(player_discord_id):
             match.players[player_id].discord_id = discord_id
-            match.players[player_id].steam_id = await self.discord_to_steam_id(discord_id)
-        players_ranking = await self.get_players_ranking(match)
-        print(match.is_cloud, match.game_mode, match.game)
-        players_season_ranking = await self.get_players_ranking(match, is_seasonal=True)
-        players_combined_ranking = await self.get_players_ranking(match, is_combined=True)
-        match, _ = self.update_player_stats(match, players_ranking, "delta")
-        match, _ = self.update_player_stats(match, players_season_ranking, "season_delta")
-        match, _ = self.update_player_stats(match, players_combined_ranking, "combined_delta")
+            match.players[player_id].steam_id = by_discord.get(discord_id)
         changes = {}
-        changes["discord_messages_id_list"] = res['discord_messages_id_list'] + [discord_message_id]
         for i, player in enumerate(res['players']):
             changes[f"players.{i}.discord_id"] = player_discord_id[i]
-            changes[f"players.{i}.steam_id"] = match.players[player_id].steam_id
-            changes[f"players.{i}.delta"] = match.players[i].delta
-            changes[f"players.{i}.season_delta"] = match.players[i].season_delta
-            changes[f"players.{i}.combined_delta"] = match.players[i].combined_delta
-        await self.pending_matches.update_one({"_id": oid}, {"$set": changes})
-        logger.info(f"✅ 🔄 Assigned player id for match {match_id}")
-        updated = await self.pending_matches.find_one({"_id": oid})
-        updated["match_id"] = str(updated.pop("_id"))
+            changes[f"players.{i}.steam_id"] = match.players[i].steam_id
+        if self._rating_signature(match) != signature:
+            players_ranking, players_season_ranking, players_combined_ranking = await asyncio.gather(
+                self.get_players_ranking(match),
+                self.get_players_ranking(match, is_seasonal=True),
+                self.get_players_ranking(match, is_combined=True),
+            )
+            match, _ = await asyncio.to_thread(
+                self.update_player_stats,
+                match,
+                [players_ranking, players_season_ranking, players_combined_ranking],
+                ["delta", "season_delta", "combined_delta"],
+            )
+            for i, player in enumerate(res['players']):
+                changes[f"players.{i}.delta"] = match.players[i].delta
+                changes[f"players.{i}.season_delta"] = match.players[i].season_delta
+                changes[f"players.{i}.combined_delta"] = match.players[i].combined_delta
+        updated = await self.pending_matches.find_one_and_update(
+            {"_id": oid},
+            {"$set": changes, "$push": {"discord_messages_id_list": discord_message_id}},
+            return_document=ReturnDocument.AFTER,
+        )
+        logger.info("✅ 🔄 Assigned player id for match %s", match_id)
+        self._to_response(updated)
         return updated
 
     async def assign_sub(self, match_id: str, sub_in_id: str, sub_out_discord_id: str, discord_message_id: str) -> Dict[str, Any]:
@@ -420,7 +655,7 @@ class MatchService:
         res = await self.pending_matches.find_one({"_id": oid})
         if res == None:
             raise NotFoundError("Match not found")
-        match = MatchModel(**res)
+        match = MatchModel.model_validate(res)
         if int(sub_in_id) < 0 or int(sub_in_id) >= len(match.players):
             raise MatchServiceError("Sub in Player ID out of range. Must be between 0 and number of players - 1")
         match.players[int(sub_in_id)].is_sub = True
@@ -439,17 +674,21 @@ class MatchService:
             is_sub = False,
             subbed_out = True,
         ))
-        players_ranking = await self.get_players_ranking(match)
-        players_season_ranking = await self.get_players_ranking(match, is_seasonal=True)
-        players_combined_ranking = await self.get_players_ranking(match, is_combined=True)
-        match, _ = self.update_player_stats(match, players_ranking, "delta")
-        match, _ = self.update_player_stats(match, players_season_ranking, "season_delta")
-        match, _ = self.update_player_stats(match, players_combined_ranking, "combined_delta")
+        players_ranking, players_season_ranking, players_combined_ranking = await asyncio.gather(
+            self.get_players_ranking(match),
+            self.get_players_ranking(match, is_seasonal=True),
+            self.get_players_ranking(match, is_combined=True),
+        )
+        match, _ = await asyncio.to_thread(
+            self.update_player_stats,
+            match,
+            [players_ranking, players_season_ranking, players_combined_ranking],
+            ["delta", "season_delta", "combined_delta"],
+        )
         match.discord_messages_id_list = res['discord_messages_id_list'] + [discord_message_id]
-        await self.pending_matches.replace_one({"_id": oid}, match.dict())
-        updated = await self.pending_matches.find_one({"_id": oid})
-        updated["match_id"] = str(updated.pop("_id"))
-        logger.info(f"✅ 🔄 Match {match_id}, sub_in: {sub_in_id}, sub_out: {sub_out_discord_id}")
+        updated = await self.pending_matches.find_one_and_replace({"_id": oid}, match.model_dump(), return_document=ReturnDocument.AFTER)
+        self._to_response(updated)
+        logger.info("✅ 🔄 Match %s, sub_in: %s, sub_out: %s", match_id, sub_in_id, sub_out_discord_id)
         return updated
     
     async def remove_sub(self, match_id: str, sub_out_id: str, discord_message_id: str) -> Dict[str, Any]:
@@ -457,79 +696,120 @@ class MatchService:
         res = await self.pending_matches.find_one({"_id": oid})
         if res == None:
             raise NotFoundError("Match not found")
-        match = MatchModel(**res)
+        match = MatchModel.model_validate(res)
         if int(sub_out_id) < 1 or int(sub_out_id) >= len(match.players) or not match.players[int(sub_out_id)].subbed_out:
             raise MatchServiceError("Sub in Player ID out of range. Must be between 1 and number of players - 1")
         match.players[int(sub_out_id)-1].is_sub = False
         match.players.pop(int(sub_out_id))
-        players_ranking = await self.get_players_ranking(match)
-        players_season_ranking = await self.get_players_ranking(match, is_seasonal=True)
-        players_combined_ranking = await self.get_players_ranking(match, is_combined=True)
-        match, _ = self.update_player_stats(match, players_ranking, "delta")
-        match, _ = self.update_player_stats(match, players_season_ranking, "season_delta")
-        match, _ = self.update_player_stats(match, players_combined_ranking, "combined_delta")
+        players_ranking, players_season_ranking, players_combined_ranking = await asyncio.gather(
+            self.get_players_ranking(match),
+            self.get_players_ranking(match, is_seasonal=True),
+            self.get_players_ranking(match, is_combined=True),
+        )
+        match, _ = await asyncio.to_thread(
+            self.update_player_stats,
+            match,
+            [players_ranking, players_season_ranking, players_combined_ranking],
+            ["delta", "season_delta", "combined_delta"],
+        )
         match.discord_messages_id_list = res['discord_messages_id_list'] + [discord_message_id]
-        await self.pending_matches.replace_one({"_id": oid}, match.dict())
-        updated = await self.pending_matches.find_one({"_id": oid})
-        updated["match_id"] = str(updated.pop("_id"))
-        logger.info(f"✅ 🔄 Match {match_id}, sub_out_id: {sub_out_id}")
+        updated = await self.pending_matches.find_one_and_replace({"_id": oid}, match.model_dump(), return_document=ReturnDocument.AFTER)
+        self._to_response(updated)
+        logger.info("✅ 🔄 Match %s, sub_out_id: %s", match_id, sub_out_id)
         return updated
 
     async def approve_match(self, match_id: str, approver_discord_id: str) -> Dict[str, Any]:
-        # Use a lock to make sure only one approval happens at a time
-        async with approve_lock:
-            oid = self._to_oid(match_id)
-            res = await self.pending_matches.find_one({"_id": oid})
-            if res == None:
-                raise NotFoundError("Match not found")
-            match = MatchModel(**res)
+        oid = self._to_oid(match_id)
+        approved_at = datetime.now(UTC)
+        # Claim the match with a compare-and-set on a dedicated timestamp
+        # instead of a process-wide lock: only the first concurrent approval
+        # matches the filter, and approvals of different matches no longer
+        # serialize. The filter also matches claims older than the timeout,
+        # so a worker that died between claim and commit cannot wedge the
+        # match — the next approval attempt steals the stale claim.
+        stale_cutoff = approved_at - timedelta(seconds=APPROVE_CLAIM_TIMEOUT_S)
+        res = await self.pending_matches.find_one_and_update(
+            {"_id": oid, "$or": [
+                {"approval_claimed_at": None},
+                {"approval_claimed_at": {"$lt": stale_cutoff}},
+            ]},
+            {"$set": {"approval_claimed_at": approved_at}},
+        )
+        if res is None:
+            if await self.pending_matches.count_documents({"_id": oid}, limit=1):
+                raise MatchServiceError("Match approval already in progress")
+            raise NotFoundError("Match not found")
+        res.pop("approval_claimed_at", None)
+        try:
+            match = MatchModel.model_validate(res)
             for i, player in enumerate(match.players):
                 if player.discord_id == None:
                     raise MatchServiceError(f"Player {player.user_name} has no linked Discord ID")
-            players_ranking = await self.get_players_ranking(match)
-            players_season_ranking = await self.get_players_ranking(match, is_seasonal=True)
-            players_combined_ranking = await self.get_players_ranking(match, is_combined=True)
-            match, post = self.update_player_stats(match, players_ranking, "delta")
-            match, season_post = self.update_player_stats(match, players_season_ranking, "season_delta")
-            match, combined_post = self.update_player_stats(match, players_combined_ranking, "combined_delta")
-            match.approved_at = datetime.now(UTC)
+            players_ranking, players_season_ranking, players_combined_ranking = await asyncio.gather(
+                self.get_players_ranking(match),
+                self.get_players_ranking(match, is_seasonal=True),
+                self.get_players_ranking(match, is_combined=True),
+            )
+            match, posts = await asyncio.to_thread(
+                self.update_player_stats,
+                match,
+                [players_ranking, players_season_ranking, players_combined_ranking],
+                ["delta", "season_delta", "combined_delta"],
+            )
+            post, season_post, combined_post = posts
+            match.approved_at = approved_at
             match.approver_discord_id = approver_discord_id
             stats_table = self.get_stat_table(match.is_cloud, match.game_mode, match.game, is_seasonal=False)
             season_stats_table = self.get_stat_table(match.is_cloud, match.game_mode, match.game, is_seasonal=True)
             combined_stats_table = self.get_stat_table(match.is_cloud, match.game_mode, match.game, is_combined=True)
+            # One pipelined command per table instead of 3N+N round-trips
+            # serialized through the session.
+            stats_ops, season_ops, combined_ops, subs_ops = [], [], [], []
+            for i, player in enumerate(match.players):
+                player_filter = {"_id": Int64(player.discord_id)}
+                stats_ops.append(ReplaceOne(player_filter, self.get_player_stats_db(match, player, post[i], "delta"), upsert=True))
+                season_ops.append(ReplaceOne(player_filter, self.get_player_stats_db(match, player, season_post[i], "season_delta"), upsert=True))
+                combined_ops.append(ReplaceOne(player_filter, self.get_player_stats_db(match, player, combined_post[i], "combined_delta"), upsert=True))
+                if player.is_sub:
+                    subs_ops.append(UpdateOne({"_id": player.discord_id}, {"$inc": {"subs_in": 1}}, upsert=True))
             session = await self.db.start_session()
             async with session:
                 async with session.start_transaction():
                     try:
-                        for i, player in enumerate(match.players):
-                            player_stats_db = self.get_player_stats_db(match, player, post[i], "delta")
-                            player_season_stats_db = self.get_player_stats_db(match, player, season_post[i], "season_delta")
-                            player_combined_stats_db = self.get_player_stats_db(match, player, combined_post[i], "combined_delta")
-                            await stats_table.replace_one({"_id": Int64(player.discord_id)}, player_stats_db, upsert=True, session=session)
-                            await season_stats_table.replace_one({"_id": Int64(player.discord_id)}, player_season_stats_db, upsert=True, session=session)
-                            await combined_stats_table.replace_one({"_id": Int64(player.discord_id)}, player_combined_stats_db, upsert=True, session=session)
-                            if player.is_sub:
-                                await self.subs_table.update_one(
-                                    {"_id": player.discord_id},
-                                    {"$inc": {"subs_in": 1}},
-                                    upsert=True,
-                                    session=session
-                                )
-                        validated = await self.validated_matches.insert_one(match.dict(), session=session)
+                        # The bulk_writes stay sequential on purpose: they all
+                        # ride the one transaction session, and a ClientSession
+                        # only supports one in-flight operation — gathering
+                        # them would raise InvalidOperation, not overlap them.
+                        # Each await is a single pipelined command already.
+                        await stats_table.bulk_write(stats_ops, ordered=False, session=session)
+                        await season_stats_table.bulk_write(season_ops, ordered=False, session=session)
+                        await combined_stats_table.bulk_write(combined_ops, ordered=False, session=session)
+                        if subs_ops:
+                            await self.subs_table.bulk_write(subs_ops, ordered=False, session=session)
+                        validated = await self.validated_matches.insert_one(match.model_dump(), session=session)
                         await self.pending_matches.delete_one({"_id": oid}, session=session)
                         # Commit the transaction
                         await session.commit_transaction()
                     except Exception as e:
                         # Abort the transaction in case of an error
-                        print("An error occurred while writing to DB:", e)
+                        logger.error("An error occurred while writing to DB: %s", e)
                         await session.abort_transaction()
                         raise MatchServiceError(f"An error occured during writing to DB: {e}")
-            logger.info(f"✅ 🔄 Match {match_id} approved")
-            return {"match_id": str(validated.inserted_id), **match.dict()}
+        except BaseException:
+            # Release the claim promptly after a validation error or aborted
+            # transaction; the filter on our own timestamp makes sure we do
+            # not clear a claim someone else has since stolen.
+            await self.pending_matches.update_one(
+                {"_id": oid, "approval_claimed_at": approved_at},
+                {"$set": {"approval_claimed_at": None}},
+            )
+            raise
+        logger.info("✅ 🔄 Match %s approved", match_id)
+        return self._convert_times(self._encode_save_file_hash({"match_id": str(validated.inserted_id), **match.model_dump()}))
 
     async def get_leaderboard(self, is_cloud: str, game: str, game_mode: str, is_seasonal: bool, is_combined: bool) -> Dict[str, Any]:
         stats_table = self.get_stat_table(is_cloud == "PBC", game_mode, game, is_seasonal=is_seasonal, is_combined=is_combined)
-        last_updated_item = await stats_table.find_one(sort=[("lastModified", -1)])
+        last_updated_item = await stats_table.find_one(sort=[("lastModified", -1)], projection={"lastModified": 1})
         if (last_updated_item == None):
             return {
                 "rankings": [],
@@ -537,7 +817,18 @@ class MatchService:
             }
         last_updated = last_updated_item["lastModified"]
         last_updated = int(last_updated.timestamp())
-        cursor = stats_table.find({ "games": { "$gt": 2 } }).sort([("mu", -1), ("sigma", 1)]).limit(100)
+        # Project down to the leaderboard columns so the 100 returned docs skip
+        # the civs dict, which dominates row size on long-lived accounts. The
+        # (mu desc, sigma asc, games) index feeds the sort directly, so the
+        # scan stops at the limit; wins/first still come from the documents.
+        cursor = (
+            stats_table.find(
+                {"games": {"$gt": 2}},
+                projection={"mu": 1, "games": 1, "wins": 1, "first": 1},
+            )
+            .sort([("mu", -1), ("sigma", 1)])
+            .limit(100)
+        )
         leaderboard = []
         async for doc in cursor:
             leaderboard.append({
@@ -1,7 +1,11 @@
+from functools import lru_cache
 from trueskill import TrueSkill, Rating
 from app.config import settings
 
+@lru_cache(maxsize=1)
 def make_ts_env() -> TrueSkill:
+    # TrueSkill() rebuilds factor-graph constants each call; the settings it
+    # reads are fixed at startup, so one environment serves the process.
     return TrueSkill(
         mu=settings.ts_mu,
         sigma=settings.ts_sigma,
@@ -1,6 +1,9 @@
+from functools import lru_cache
+
 from app.parsers.civ6leaders import civ6_leaders_dict
 from app.parsers.civ7leaders import civ7_leaders_dict
 
+@lru_cache(maxsize=4096)
 def get_cpl_name(game: str, civ: str, leader: str = None) -> str:
     """
     Convert in-game civilization and leader names to CPL standard names.
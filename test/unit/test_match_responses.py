@@ -0,0 +1,49 @@
+from datetime import datetime, UTC
+
+import orjson
+from bson import ObjectId
+
+from app.models.db_models import MatchModel
+from app.services.match_service import MatchService
+
+
+def _match_model():
+    return MatchModel(
+        game="civ6",
+        turn=120,
+        map_type="Pangaea",
+        game_mode="ffa",
+        is_cloud=False,
+        players=[
+            {"civ": "Rome", "team": 0, "placement": 0, "quit": False},
+            {"civ": "Egypt", "team": 1, "placement": 1, "quit": False},
+        ],
+        parser_version="1",
+        discord_messages_id_list=["123"],
+        created_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC),
+        save_file_hash=b"\x00\x01\xfe\xff" * 4,  # raw digest, not valid UTF-8
+        reporter_discord_id="42",
+    )
+
+
+def test_create_and_approve_response_dicts_are_json_serializable():
+    # The upload and approve paths build their response from model_dump(),
+    # not from a Mongo doc via _to_response; the raw digest bytes must still
+    # come out base64-encoded or orjson refuses to serialize the body.
+    doc = MatchService._convert_times(
+        MatchService._encode_save_file_hash({"match_id": str(ObjectId()), **_match_model().model_dump()})
+    )
+    assert isinstance(doc["save_file_hash"], str)
+    assert doc["created_at_ms"] == 1767323045000
+    assert doc["approved_at_ms"] is None
+    orjson.dumps(doc)  # raises TypeError if any bytes/datetime leaked through
+
+
+def test_to_response_matches_model_dump_encoding():
+    # A doc fetched from Mongo and a doc built from the model must encode
+    # save_file_hash identically.
+    match = _match_model()
+    fetched = {"_id": ObjectId(), **match.model_dump()}
+    via_response = MatchService._to_response(fetched)
+    via_dump = MatchService._encode_save_file_hash(match.model_dump())
+    assert via_response["save_file_hash"] == via_dump["save_file_hash"]